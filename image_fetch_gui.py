@@ -1,19 +1,20 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import asyncio
 import os
 import platform
 import subprocess
-import threading
-import json
+import time
+import tkinter
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 
-try:
-    import customtkinter as ctk
-except Exception:  # pragma: no cover - fallback to legacy GUI
-    ctk = None
+# customtkinter is imported on first use (see _load_ctk) so that the classic
+# fallback and plain imports of this module don't pay for it
+ctk = None
 
 from tkinter import messagebox  # used in fallback cases
 import webbrowser
@@ -27,19 +28,33 @@ try:
 except Exception:
     _DND_AVAILABLE = False
 
-from image_scraper import (
-    crawl_site,
-    collect_images_from_page,
-    download_all,
-    zip_output_folder,
-)
+_SYSTEM = platform.system()
+
+# Minimum seconds between progress repaints while downloading
+PROGRESS_INTERVAL = 0.1
+# Milliseconds to collect log lines before writing them to the textbox in one go
+LOG_FLUSH_MS = 150
+# Milliseconds between asyncio pumps while a scrape runs; I/O wakes the loop
+# immediately where Tk can watch its selector, this only paces timers (and Windows)
+ASYNC_POLL_MS = 20
+
+
+def _load_ctk():
+    global ctk
+    if ctk is None:
+        try:
+            import customtkinter
+        except Exception:  # pragma: no cover - fallback to legacy GUI
+            return None
+        ctk = customtkinter
+    return ctk
 
 
 def _open_path(p: Path):
     try:
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             os.startfile(p)  # type: ignore[attr-defined]
-        elif platform.system() == "Darwin":
+        elif _SYSTEM == "Darwin":
             subprocess.run(["open", str(p)], check=False)
         else:
             subprocess.run(["xdg-open", str(p)], check=False)
@@ -49,7 +64,7 @@ def _open_path(p: Path):
 
 class ModernImageScraperGUI:
     def __init__(self):
-        if ctk is None:
+        if _load_ctk() is None:
             raise RuntimeError("customtkinter is required for the modern GUI")
 
         ctk.set_appearance_mode("system")
@@ -70,8 +85,17 @@ class ModernImageScraperGUI:
 
         self.total = 0
         self.completed = 0
+        self._last_tick = 0.0
         self.out_dir_path: Path | None = None
         self.zip_path: Path | None = None
+        self._log_q: deque[str] = deque()
+        self._log_flush_scheduled = False
+
+        # Scrapes run as a task on this loop, driven from Tk's own event loop
+        self.loop = asyncio.new_event_loop()
+        self._task: asyncio.Task | None = None
+        self._pump_pending = False
+        self._loop_fd = self._watch_loop_fd()
 
         self._build_ui()
         self._load_prefs()
@@ -90,7 +114,7 @@ class ModernImageScraperGUI:
 
     # Preferences
     def _config_dir(self) -> Path:
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             base = Path(os.environ.get("APPDATA", Path.home()))
             return base / "imageFetch"
         else:
@@ -103,7 +127,9 @@ class ModernImageScraperGUI:
         try:
             cfg = self._config_file()
             if cfg.exists():
-                data = json.load(open(cfg, "r", encoding="utf-8"))
+                from image_scraper import read_json
+
+                data = read_json(cfg)
                 if isinstance(data, dict):
                     owd = data.get("open_when_done")
                     if isinstance(owd, bool):
@@ -124,6 +150,8 @@ class ModernImageScraperGUI:
 
     def _save_prefs(self):
         try:
+            from image_scraper import write_json
+
             cfg_dir = self._config_dir()
             cfg_dir.mkdir(parents=True, exist_ok=True)
             data = {
@@ -132,7 +160,7 @@ class ModernImageScraperGUI:
                 "theme": self.appearance_option.get(),
                 "color_theme": self.color_option.get(),
             }
-            json.dump(data, open(self._config_file(), "w", encoding="utf-8"), indent=2)
+            write_json(self._config_file(), data)
         except Exception:
             pass
 
@@ -248,12 +276,60 @@ class ModernImageScraperGUI:
         state = "normal" if self.crawl_var.get() else "disabled"
         self.max_pages_entry.configure(state=state)
 
-    def _ui(self, fn):
-        self.root.after(0, fn)
+    # asyncio integration
+    def _watch_loop_fd(self) -> int | None:
+        # Selector loops expose a descriptor that turns readable whenever they have
+        # I/O to process; let Tk watch it. Windows (proactor loop, no Tcl file
+        # handlers) gets by on the ASYNC_POLL_MS pump alone.
+        selector = getattr(self.loop, "_selector", None)
+        if selector is None:
+            return None
+        try:
+            fd = selector.fileno()
+            self.root.tk.createfilehandler(fd, tkinter.READABLE, self._pump_asyncio)
+        except Exception:
+            return None
+        return fd
+
+    def _pump_asyncio(self, *_args):
+        # Run one non-blocking loop iteration: ready I/O plus due callbacks.
+        # Skipped when re-entered from a nested Tk loop (e.g. a modal dialog).
+        if self.loop.is_running() or self.loop.is_closed():
+            return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        # Callbacks queued by that iteration (task wakeups, to_thread results, lock
+        # handoffs) need another one; run it after pending Tk events instead of
+        # waiting for the next I/O wakeup or ASYNC_POLL_MS tick
+        if getattr(self.loop, "_ready", None) and not self._pump_pending:
+            self._pump_pending = True
+            self.root.after(0, self._pump_again)
+
+    def _pump_again(self):
+        self._pump_pending = False
+        self._pump_asyncio()
+
+    def _tick_asyncio(self):
+        self._pump_asyncio()
+        if self._task is not None and not self._task.done():
+            self.root.after(ASYNC_POLL_MS, self._tick_asyncio)
 
     def log_line(self, msg: str):
-        self.log.insert("end", msg + "\n")
-        self.log.see("end")
+        # Just queue the line; _flush_log writes the batch
+        self._log_q.append(msg + "\n")
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(LOG_FLUSH_MS, self._flush_log)
+
+    def _flush_log(self):
+        # Clear the flag first so lines queued while draining schedule another flush
+        self._log_flush_scheduled = False
+        batch = []
+        while self._log_q:
+            batch.append(self._log_q.popleft())
+        if batch:
+            self.log.insert("end", "".join(batch))
+            self.log.see("end")
 
     def set_progress(self, total: int, completed: int):
         self.total = max(total, 1)
@@ -274,16 +350,18 @@ class ModernImageScraperGUI:
         if not url:
             messagebox.showerror("Error", "Please enter a URL.")
             return
-        if not urlparse(url).scheme:
+        parsed = urlparse(url)
+        if not parsed.scheme:
             url = "https://" + url
             self.url_var.set(url)
-        if not urlparse(url).netloc:
+            parsed = urlparse(url)
+        if not parsed.netloc:
             messagebox.showerror("Error", "Invalid URL. Please include a valid domain.")
             return
 
         out_dir_str = (self.out_dir_var.get() or "").strip()
         if not out_dir_str:
-            default_dir_name = f"images_{urlparse(url).netloc}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            default_dir_name = f"images_{parsed.netloc}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             out_dir_str = str(Path.cwd() / default_dir_name)
             self.out_dir_var.set(out_dir_str)
 
@@ -291,6 +369,7 @@ class ModernImageScraperGUI:
         self.start_btn.configure(state="disabled")
         self.open_folder_btn.configure(state="disabled")
         self.open_zip_btn.configure(state="disabled")
+        self._log_q.clear()
         self.log.delete("1.0", "end")
         self.progress_label.configure(text="Starting...")
         self.progress.set(0)
@@ -298,84 +377,128 @@ class ModernImageScraperGUI:
         self.out_dir_path = Path(out_dir_str)
         self._save_prefs()
 
-        threading.Thread(target=self._run_scrape, args=(url,), daemon=True).start()
+        self._last_tick = 0.0
+        self._task = self.loop.create_task(self._run_scrape_async(url))
+        self._tick_asyncio()
 
-    def _run_scrape(self, url: str):
+    async def _run_scrape_async(self, url: str):
+        # Runs on the Tk thread (see _pump_asyncio), so widgets are updated directly
         try:
-            # Pages
+            # Deferred so the window paints before the scraper's dependencies load
+            from image_scraper import (
+                clear_page_cache,
+                client_session,
+                crawl_site_async,
+                collect_images_from_page_async,
+                download_all_async,
+                data_url_previews,
+                parse_executor,
+                partition_image_urls,
+                write_json,
+                zip_output_folder,
+            )
+
+            # Pages last read by a previous scrape must be fetched (revalidated) again
+            clear_page_cache()
+
             if self.crawl_var.get():
-                self._ui(lambda: self.log_line(f"Crawling up to {self.max_pages_var.get()} pages..."))
                 try:
                     max_pages = max(1, int(self.max_pages_var.get()))
                 except Exception:
                     max_pages = 20
-                pages = crawl_site(url, max_pages=max_pages)
             else:
-                pages = [url]
-            self._ui(lambda: self.log_line(f"Scanning {len(pages)} page(s) for images..."))
-
-            # Collect images
-            all_images = set()
-            all_css = set()
-            for p in pages:
-                imgs, css = collect_images_from_page(p)
-                all_images.update(imgs)
-                all_css.update(css)
-                self._ui(lambda p=p, i=len(imgs): self.log_line(f"Found {i} images on {p}"))
-
-            data_images = {u for u in all_images if u.startswith("data:image/")}
-            http_images = [u for u in all_images if not u.startswith("data:")]
-
-            self._ui(lambda: self.log_line(f"Found {len(all_images)} images ({len(http_images)} downloadable, {len(data_images)} data URLs)."))
-
-            # Download with progress
-            def progress_cb(total, completed):
-                self._ui(lambda: self.set_progress(total, completed))
-
-            successes, failures = download_all(http_images, self.out_dir_path, progress_cb=progress_cb)
+                max_pages = 1
+            # One parse executor for crawl and scan, sized by the pages it may have to parse
+            parse_pool = parse_executor(max_pages)
+            try:
+                async with client_session() as session:
+                    # Pages
+                    if self.crawl_var.get():
+                        self.log_line(f"Crawling up to {self.max_pages_var.get()} pages...")
+                        pages = await crawl_site_async(url, max_pages=max_pages, session=session, executor=parse_pool)
+                    else:
+                        pages = [url]
+                    self.log_line(f"Scanning {len(pages)} page(s) for images...")
+
+                    # Collect images; pages are scanned concurrently and logged as they finish
+                    async def collect(p):
+                        return (p, *await collect_images_from_page_async(p, session=session, executor=parse_pool))
+
+                    all_images = set()
+                    all_css = set()
+                    for done in asyncio.as_completed([collect(p) for p in pages]):
+                        p, imgs, css = await done
+                        all_images.update(imgs)
+                        all_css.update(css)
+                        self.log_line(f"Found {len(imgs)} images on {p}")
+
+                    http_images, data_images = partition_image_urls(all_images)
+
+                    self.log_line(f"Found {len(all_images)} images ({len(http_images)} downloadable, {len(data_images)} data URLs).")
+
+                    # Download with progress, coalesced to ~10 Hz; the final tick always goes through
+                    def progress_cb(total, completed):
+                        now = time.monotonic()
+                        if completed == total or now - self._last_tick >= PROGRESS_INTERVAL:
+                            self._last_tick = now
+                            self.set_progress(total, completed)
+
+                    successes, failures = await download_all_async(http_images, self.out_dir_path, progress_cb=progress_cb, session=session)
+            finally:
+                await asyncio.to_thread(parse_pool.shutdown)
 
             manifest = {
                 "source_pages": pages,
                 "downloaded": [{"url": u, "path": p} for (u, p) in successes],
                 "failed": failures,
-                "data_urls": list(data_images)[:50],
                 "css_files": list(all_css),
             }
-            (self.out_dir_path / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            if data_images:
+                manifest["data_urls"] = data_url_previews(data_images)
+            await asyncio.to_thread(write_json, self.out_dir_path / "manifest.json", manifest)
 
             # Zip
             try:
-                zip_path = zip_output_folder(self.out_dir_path)
+                zip_path = await asyncio.to_thread(zip_output_folder, self.out_dir_path)
                 self.zip_path = zip_path
             except Exception as e:
-                self._ui(lambda e=e: self.log_line(f"Failed to create ZIP: {e}"))
+                self.log_line(f"Failed to create ZIP: {e}")
                 zip_path = None
 
-            self._ui(lambda: self.log_line(f"Downloaded {len(successes)} images; failed {len(failures)}."))
+            self.log_line(f"Downloaded {len(successes)} images; failed {len(failures)}.")
             if zip_path:
-                self._ui(lambda: self.log_line(f"Created ZIP: {zip_path}"))
-            self._ui(lambda: self.progress_label.configure(text="Done."))
-            self._ui(lambda: self.start_btn.configure(state="normal"))
-            self._ui(lambda: self.open_folder_btn.configure(state="normal"))
-            self._ui(lambda: self.open_zip_btn.configure(state="normal"))
+                self.log_line(f"Created ZIP: {zip_path}")
+            self.progress_label.configure(text="Done.")
+            self.start_btn.configure(state="normal")
+            self.open_folder_btn.configure(state="normal")
+            self.open_zip_btn.configure(state="normal")
 
             # Auto-open
             if self.open_when_done_var.get() and self.out_dir_path and self.out_dir_path.exists():
-                self._ui(lambda: _open_path(self.out_dir_path))
+                _open_path(self.out_dir_path)
         except Exception as e:
-            self._ui(lambda: self.start_btn.configure(state="normal"))
-            self._ui(lambda: messagebox.showerror("Error", str(e)))
+            self.start_btn.configure(state="normal")
+            # Modal dialogs spin a nested Tk loop; show it once this task step returns
+            self.root.after(0, lambda msg=str(e): messagebox.showerror("Error", msg))
 
     def open_folder(self):
-        if self.out_dir_path and self.out_dir_path.exists():
+        if self.out_dir_path:
             _open_path(self.out_dir_path)
 
     def open_zip(self):
-        if self.zip_path and self.zip_path.exists():
+        if self.zip_path:
             _open_path(self.zip_path)
 
     def _on_close(self):
         self._save_prefs()
+        if self._loop_fd is not None:
+            self.root.tk.deletefilehandler(self._loop_fd)
+        if not self.loop.is_running():
+            # Let the cancelled scrape unwind (closing its HTTP session) before the loop goes
+            if self._task is not None and not self._task.done():
+                self._task.cancel()
+                self.loop.run_until_complete(asyncio.gather(self._task, return_exceptions=True))
+            self.loop.close()
         self.root.destroy()
 
     # Drag-and-drop handler
@@ -421,7 +544,7 @@ class ModernImageScraperGUI:
 
 
 def run():
-    if ctk is None:
+    if _load_ctk() is None:
         # Fallback to classic GUI if customtkinter not available
         try:
             from image_scraper_gui import run as classic_run
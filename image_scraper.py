@@ -1,24 +1,37 @@
 #!/usr/bin/env python3
+import asyncio
 import concurrent.futures
+import contextlib
+import functools
 import hashlib
+import itertools
 import json
 import os
 import re
+import string
 import sys
 import threading
 import time
+import zipfile
 import platform
 import subprocess
+from collections import OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Set, Tuple, Dict, List
+from typing import BinaryIO, Deque, Iterable, Set, Tuple, Dict, List
 
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, urldefrag
 import shutil
-from requests import exceptions as req_exc
 import argparse
+from importlib.util import find_spec
+
+# Heavy third-party modules are imported on first use so that importing this
+# module (or launching the GUI) stays fast; only their availability is probed here.
+_HAS_AIOHTTP = find_spec("aiohttp") is not None  # else: threaded requests downloader
+_HAS_REQUESTS_CACHE = find_spec("requests_cache") is not None  # on-disk cache for HTML/CSS
+_PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"  # BeautifulSoup parser
+_HAS_ORJSON = find_spec("orjson") is not None  # else: stdlib json
+_SYSTEM = platform.system()
 
 
 USER_AGENT = (
@@ -29,92 +42,270 @@ USER_AGENT = (
 
 HEADERS = {"User-Agent": USER_AGENT}
 REQUEST_TIMEOUT = 15
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+# In-flight downloads for the aiohttp downloader (one event loop, shared pool)
+ASYNC_MAX_CONCURRENCY = 64
+# Scrapes that may parse this many pages parse in a process pool to sidestep the GIL;
+# smaller ones stay on threads (see parse_executor)
+PROCESS_POOL_MIN_PAGES = 100
+# Image bodies are streamed to disk in CHUNK_SIZE reads through a WRITE_BUFFER_SIZE buffer
+CHUNK_SIZE = 1 << 16
+WRITE_BUFFER_SIZE = 1 << 20
+# manifest.json only previews inline data: images: this many, each cut to this many characters
+MANIFEST_DATA_URLS = 50
+MANIFEST_DATA_URL_CHARS = 120
+
+# Pages and stylesheets go through a persistent HTTP cache when requests-cache is
+# installed; images always use the plain session. 0 (requests-cache's EXPIRE_IMMEDIATELY)
+# revalidates every hit with ETag/Last-Modified, so unchanged pages come back as a cheap
+# 304 and changed ones are never served stale.
+HTTP_CACHE_EXPIRE_AFTER = 0
+# Bodies fetched during one scrape are also kept in memory, so the page crawl_site
+# just read is not downloaded again by collect_images_from_page. Long-lived callers
+# call clear_page_cache() when a new scrape starts.
+PAGE_CACHE_SIZE = 256
+PAGE_CACHE_TTL = 300
+_PAGE_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_PAGE_CACHE_LOCK = threading.Lock()
+_SESSION = None
+_TEXT_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session():
+    # One pooled keep-alive session per process; retries are handled by the fetch loops.
+    # requests already advertises gzip/deflate (and br when a brotli decoder is installed).
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _cache_dir() -> Path:
+    if _SYSTEM == "Windows":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home()))
+        return base / "imageFetch" / "cache"
+    return Path.home() / ".cache" / "imageFetch"
+
+
+def _text_session():
+    global _TEXT_SESSION
+    base = _session()
+    with _SESSION_LOCK:
+        if _TEXT_SESSION is None:
+            _TEXT_SESSION = base
+            if _HAS_REQUESTS_CACHE:
+                try:
+                    from requests_cache import CachedSession
+
+                    cache_dir = _cache_dir()
+                    cache_dir.mkdir(parents=True, exist_ok=True)
+                    session = CachedSession(
+                        cache_name=str(cache_dir / "http"),
+                        backend="sqlite",
+                        expire_after=HTTP_CACHE_EXPIRE_AFTER,
+                        allowable_codes=(200, 203, 301, 302, 308),
+                        stale_if_error=True,
+                    )
+                    session.headers.update(HEADERS)
+                    adapter = base.get_adapter("https://")
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    _TEXT_SESSION = session
+                except Exception:
+                    # Unusable cache location; fetch uncached
+                    pass
+        return _TEXT_SESSION
+
+
+def _cached_text(url: str) -> str | None:
+    with _PAGE_CACHE_LOCK:
+        entry = _PAGE_CACHE.get(url)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > PAGE_CACHE_TTL:
+            del _PAGE_CACHE[url]
+            return None
+        _PAGE_CACHE.move_to_end(url)
+        return entry[1]
+
+
+def _remember_text(url: str, text: str) -> str:
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[url] = (time.monotonic(), text)
+        _PAGE_CACHE.move_to_end(url)
+        if len(_PAGE_CACHE) > PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+    return text
+
+
+def clear_page_cache() -> None:
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE.clear()
+
+
+def clear_http_cache() -> None:
+    clear_page_cache()
+    session = _text_session()
+    if session is not _session():
+        session.cache.clear()
+
+
+# url(...) inside style attributes / <style> blocks, and inside linked CSS (group 2)
+_INLINE_URL_RE = re.compile(r"url\(\s*['\"]?([^'\"\)]+)['\"]?\s*\)")
+_CSS_URL_RE = re.compile(r"url\(\s*(['\"]?)([^'\"\)]+)\1\s*\)")
 
 IMG_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".svg", ".avif", ".tiff", ".tif"}
+_IMG_EXT_SUFFIX_RE = re.compile(
+    r"\.(?:" + "|".join(re.escape(ext[1:]) for ext in sorted(IMG_EXTENSIONS)) + r")\Z", re.IGNORECASE
+)
+
+# URL helpers run once per attribute/link/image, so the pure-Python parsers are memoized
+_urlparse = functools.lru_cache(maxsize=65536)(urlparse)
+_urljoin = functools.lru_cache(maxsize=131072)(urljoin)
 
 
+@functools.lru_cache(maxsize=65536)
 def is_probable_image_url(url: str) -> bool:
-    lower = url.lower().split("?", 1)[0].split("#", 1)[0]
-    return any(lower.endswith(ext) for ext in IMG_EXTENSIONS)
+    path = url.split("?", 1)[0].split("#", 1)[0]
+    return _IMG_EXT_SUFFIX_RE.search(path) is not None
 
 
 def absolute_url(href: str, base_url: str) -> str:
     if not href:
         return ""
-    return urljoin(base_url, href)
+    if href.startswith("data:"):
+        # Already absolute, and potentially huge; keep it out of the cache
+        return href
+    return _urljoin(base_url, href)
+
+
+def _on_netloc(url: str, netloc: str) -> bool:
+    try:
+        u = _urlparse(url)
+        return (u.scheme in {"http", "https"}) and (u.netloc == netloc)
+    except Exception:
+        return False
 
 
 def same_site(url: str, origin: str) -> bool:
     try:
-        u, o = urlparse(url), urlparse(origin)
-        return (u.scheme in {"http", "https"}) and (u.netloc == o.netloc)
+        return _on_netloc(url, _urlparse(origin).netloc)
     except Exception:
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def _selectolax_parser():
+    # Single-pass C tree walker; Lexbor since selectolax 1.0 (Modest raises on import).
+    # None means fall back to a BeautifulSoup walk.
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser
+    except ImportError:
+        pass
+    try:
+        from selectolax.parser import HTMLParser
+        return HTMLParser
+    except ImportError:
+        return None
+
+
+def _selectolax_nodes(HTMLParser, html: str):
+    root = HTMLParser(html).root
+    if root is None:
+        return
+    for node in root.traverse():
+        yield node
+        if node.tag == "template":
+            # traverse() skips template contents (a separate fragment); parse them on their
+            # own. The serializer escapes ">" in attribute values, so the start tag ends at the first one.
+            outer = node.html or ""
+            end = "</template>"
+            if outer.endswith(end):
+                yield from _selectolax_nodes(HTMLParser, outer[outer.index(">") + 1 : -len(end)])
+
+
+def _add_srcset(srcset: str | None, base_url: str, images: Set[str]) -> None:
+    if not srcset:
+        return
+    for item in srcset.split(","):
+        url_part = item.strip().split(" ", 1)[0]
+        if url_part:
+            images.add(absolute_url(url_part, base_url))
+
+
 def extract_image_urls_from_html(html: str, base_url: str) -> Tuple[Set[str], Set[str]]:
     """
     Returns (image_urls, css_urls)
     """
-    soup = BeautifulSoup(html, "html.parser")
     images: Set[str] = set()
     css_links: Set[str] = set()
 
-    # <img src> and srcset
-    for img in soup.find_all("img"):
-        src = img.get("src")
-        if src:
-            images.add(absolute_url(src, base_url))
-        srcset = img.get("srcset")
-        if srcset:
-            for item in srcset.split(","):
-                url_part = item.strip().split(" ", 1)[0]
-                if url_part:
-                    images.add(absolute_url(url_part, base_url))
-
-    # <source srcset> inside <picture>
-    for source in soup.find_all("source"):
-        srcset = source.get("srcset")
-        if srcset:
-            for item in srcset.split(","):
-                url_part = item.strip().split(" ", 1)[0]
-                if url_part:
-                    images.add(absolute_url(url_part, base_url))
-
-    # Meta images (OG/Twitter)
-    for meta in soup.find_all("meta"):
-        prop = (meta.get("property") or meta.get("name") or "").lower()
-        if prop in {"og:image", "og:image:url", "twitter:image", "twitter:image:src"}:
-            content = meta.get("content")
-            if content:
-                images.add(absolute_url(content, base_url))
-
-    # Preloaded images
-    for link in soup.find_all("link"):
-        rel = (" ".join(link.get("rel", []))).lower()
-        as_type = (link.get("as") or "").lower()
-        href = link.get("href")
-        if href and ("preload" in rel and as_type == "image"):
-            images.add(absolute_url(href, base_url))
-
-    # Inline style attributes with url(...)
-    url_pattern = re.compile(r"url\(\s*['\"]?([^'\"\)]+)['\"]?\s*\)")
-    for el in soup.find_all(style=True):
-        style = el.get("style") or ""
-        for match in url_pattern.findall(style):
-            images.add(absolute_url(match, base_url))
-
-    # <style> blocks: capture url(...) for potential images
-    for style_tag in soup.find_all("style"):
-        css_text = style_tag.get_text("\n")
-        for match in url_pattern.findall(css_text):
-            images.add(absolute_url(match, base_url))
-
-    # Linked CSS files to parse later
-    for link in soup.find_all("link", rel=True, href=True):
-        rel_vals = {r.lower() for r in link.get("rel", [])}
-        if "stylesheet" in rel_vals:
-            css_links.add(absolute_url(link["href"], base_url))
+    # Walk the tree once and dispatch on tag name
+    HTMLParser = _selectolax_parser()
+    if HTMLParser is not None:
+        nodes = ((n.tag, n.attributes, n) for n in _selectolax_nodes(HTMLParser, html))
+
+        def text_of(node) -> str:
+            return node.text(deep=True)
+    else:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, _PARSER)
+        nodes = ((el.name, el.attrs, el) for el in soup.find_all(True))
+
+        def text_of(node) -> str:
+            return node.get_text("\n")
+
+    for tag, attrs, node in nodes:
+        if tag == "img":
+            # <img src> and srcset
+            src = attrs.get("src")
+            if src:
+                images.add(absolute_url(src, base_url))
+            _add_srcset(attrs.get("srcset"), base_url, images)
+        elif tag == "source":
+            # <source srcset> inside <picture>
+            _add_srcset(attrs.get("srcset"), base_url, images)
+        elif tag == "meta":
+            # Meta images (OG/Twitter)
+            prop = (attrs.get("property") or attrs.get("name") or "").lower()
+            if prop in {"og:image", "og:image:url", "twitter:image", "twitter:image:src"}:
+                content = attrs.get("content")
+                if content:
+                    images.add(absolute_url(content, base_url))
+        elif tag == "link":
+            href = attrs.get("href")
+            if href:
+                # bs4 splits rel into a list; selectolax keeps the raw string
+                rel = attrs.get("rel") or ""
+                rel_vals = (rel if isinstance(rel, str) else " ".join(rel)).lower().split()
+                # Preloaded images
+                if "preload" in rel_vals and (attrs.get("as") or "").lower() == "image":
+                    images.add(absolute_url(href, base_url))
+                # Linked CSS files to parse later
+                if "stylesheet" in rel_vals:
+                    css_links.add(absolute_url(href, base_url))
+        elif tag == "style":
+            # <style> blocks: capture url(...) for potential images
+            for m in _INLINE_URL_RE.finditer(text_of(node)):
+                images.add(absolute_url(m.group(1), base_url))
+
+        # Inline style attributes with url(...)
+        style = attrs.get("style")
+        if style:
+            for m in _INLINE_URL_RE.finditer(style):
+                images.add(absolute_url(m.group(1), base_url))
 
     return images, css_links
 
@@ -122,8 +313,8 @@ def extract_image_urls_from_html(html: str, base_url: str) -> Tuple[Set[str], Se
 def extract_image_urls_from_css(css_text: str, base_url: str) -> Set[str]:
     images: Set[str] = set()
     # Match url(...) while ignoring data URIs unless image
-    for match in re.findall(r"url\(\s*(['\"]?)([^'\"\)]+)\1\s*\)", css_text):
-        url_candidate = match[1]
+    for m in _CSS_URL_RE.finditer(css_text):
+        url_candidate = m.group(2)
         if url_candidate.startswith("data:"):
             # Only save if data URL is an image
             if url_candidate.startswith("data:image/"):
@@ -133,8 +324,20 @@ def extract_image_urls_from_css(css_text: str, base_url: str) -> Set[str]:
     return images
 
 
+class _SafeCharTable(dict):
+    # str.translate table: [A-Za-z0-9._-] map to themselves, anything else (incl. non-ASCII) to "_"
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+_SAFE_FILENAME_TABLE = _SafeCharTable(
+    {i: (chr(i) if chr(i) in string.ascii_letters + string.digits + "._-" else "_") for i in range(128)}
+)
+
+
+@functools.lru_cache(maxsize=8192)
 def safe_filename_from_url(url: str, content_type: str | None) -> str:
-    parsed = urlparse(url)
+    parsed = _urlparse(url)
     name = os.path.basename(parsed.path)
     name = name.split("?")[0]
 
@@ -156,20 +359,25 @@ def safe_filename_from_url(url: str, content_type: str | None) -> str:
     if not ext:
         ext = ".jpg"
     # Ensure clean characters
-    clean_root = re.sub(r"[^A-Za-z0-9._-]", "_", root)
+    clean_root = root.translate(_SAFE_FILENAME_TABLE)
     return clean_root[:120] + ext
 
 
 def fetch_text(url: str) -> str | None:
+    cached = _cached_text(url)
+    if cached is not None:
+        return cached
+    from requests import exceptions as req_exc
+
     # Retry a few times for transient network issues
     for attempt in range(3):
         try:
-            r = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+            r = _text_session().get(url, timeout=REQUEST_TIMEOUT)
             if 200 <= r.status_code < 300:
                 r.encoding = r.apparent_encoding or r.encoding
-                return r.text
+                return _remember_text(url, r.text)
             # Non-2xx; do not retry for 4xx except 408/429
-            if r.status_code in {408, 429, 500, 502, 503, 504}:
+            if r.status_code in RETRY_STATUSES:
                 time.sleep(0.5 * (2 ** attempt))
                 continue
             return None
@@ -180,37 +388,21 @@ def fetch_text(url: str) -> str | None:
     return None
 
 
-def fetch_bytes(url: str) -> Tuple[bytes | None, str | None]:
-    for attempt in range(3):
-        try:
-            with requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True) as r:
-                if 200 <= r.status_code < 300:
-                    content_type = r.headers.get("Content-Type")
-                    content = r.content
-                    return content, content_type
-                if r.status_code in {408, 429, 500, 502, 503, 504}:
-                    time.sleep(0.5 * (2 ** attempt))
-                    continue
-                return None, None
-        except (req_exc.Timeout, req_exc.ConnectionError):
-            time.sleep(0.5 * (2 ** attempt))
-        except Exception:
-            return None, None
-    return None, None
-
-
 def collect_images_from_page(url: str) -> Tuple[Set[str], Set[str]]:
     html = fetch_text(url)
     if not html:
         return set(), set()
     img_urls, css_urls = extract_image_urls_from_html(html, url)
 
-    # Parse CSS files to find images
-    for css_url in list(css_urls):
-        css_text = fetch_text(css_url)
-        if css_text:
-            css_imgs = extract_image_urls_from_css(css_text, css_url)
-            img_urls.update(css_imgs)
+    # Parse CSS files to find images; stylesheets are fetched concurrently
+    css_list = list(css_urls)
+    if css_list:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(css_list))) as ex:
+            css_texts = list(ex.map(fetch_text, css_list))
+        for css_url, css_text in zip(css_list, css_texts):
+            if css_text:
+                css_imgs = extract_image_urls_from_css(css_text, css_url)
+                img_urls.update(css_imgs)
 
     # Filter by probable images or data:image
     resolved: Set[str] = set()
@@ -223,16 +415,181 @@ def collect_images_from_page(url: str) -> Tuple[Set[str], Set[str]]:
     return resolved, css_urls
 
 
+def partition_image_urls(urls: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Splits collected image URLs in one pass into (downloadable, data_image_urls).
+    Non-image data: URIs end up in neither list.
+    """
+    http_images: List[str] = []
+    data_images: List[str] = []
+    for u in urls:
+        if not u.startswith("data:"):
+            http_images.append(u)
+        elif u.startswith("data:image/"):
+            data_images.append(u)
+    return http_images, data_images
+
+
+def data_url_previews(data_urls: Iterable[str]) -> List[str]:
+    # Base64 bodies can run to megabytes; the manifest only needs enough to recognise them
+    n = MANIFEST_DATA_URL_CHARS
+    return [u[:n] + ("…" if len(u) > n else "") for u in itertools.islice(data_urls, MANIFEST_DATA_URLS)]
+
+
+def _extract_links(html: str, base_url: str) -> List[str]:
+    # Only anchor hrefs are needed; selectolax avoids building a bs4 tree for that
+    HTMLParser = _selectolax_parser()
+    if HTMLParser is not None:
+        hrefs = (a.attributes.get("href") for a in HTMLParser(html).css("a[href]"))
+    else:
+        from bs4 import BeautifulSoup
+
+        hrefs = (a["href"] for a in BeautifulSoup(html, _PARSER).find_all("a", href=True))
+    links: List[str] = []
+    for raw in hrefs:
+        if not raw:
+            continue
+        href = absolute_url(raw, base_url)
+        href, _ = urldefrag(href)
+        links.append(href)
+    return links
+
+
+def _new_client_session():
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=ASYNC_MAX_CONCURRENCY, limit_per_host=8, ttl_dns_cache=300)
+    # Per socket operation, like the requests timeout: no overall cap, which would
+    # also count the wait for a connector slot and the whole body stream
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout)
+
+
+@contextlib.asynccontextmanager
+async def client_session():
+    """
+    Yields one aiohttp session to share across the *_async helpers below,
+    or None when aiohttp is not installed (they then run the sync code in threads).
+    """
+    if not _HAS_AIOHTTP:
+        yield None
+        return
+    async with _new_client_session() as session:
+        yield session
+
+
+async def _fetch_text_async(session, url: str) -> str | None:
+    cached = _cached_text(url)
+    if cached is not None:
+        return cached
+    if _HAS_REQUESTS_CACHE:
+        # Pages and stylesheets are revalidated against the on-disk cache, which aiohttp can't use
+        return await asyncio.to_thread(fetch_text, url)
+    import aiohttp
+
+    for attempt in range(3):
+        try:
+            async with session.get(url) as r:
+                if 200 <= r.status < 300:
+                    return _remember_text(url, await r.text(errors="replace"))
+                if r.status in RETRY_STATUSES:
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    continue
+                return None
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            await asyncio.sleep(0.5 * (2 ** attempt))
+        except Exception:
+            return None
+    return None
+
+
+def parse_executor(documents: int) -> concurrent.futures.Executor:
+    """
+    Executor for the parsing done by crawl_site_async and collect_images_from_page_async;
+    create one per scrape, sized by the most pages it may parse, and pass it to both.
+    Below PROCESS_POOL_MIN_PAGES this is a thread pool, otherwise a process pool. Its
+    workers are spawned, not forked, since the caller already runs other threads.
+    """
+    if documents < PROCESS_POOL_MIN_PAGES:
+        return concurrent.futures.ThreadPoolExecutor()
+    import multiprocessing
+
+    return concurrent.futures.ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
+async def crawl_site_async(start_url: str, max_pages: int = 20, session=None, executor=None) -> List[str]:
+    # executor runs link extraction (default: the loop's thread pool); see parse_executor
+    if not _HAS_AIOHTTP:
+        return await asyncio.to_thread(crawl_site, start_url, max_pages)
+    if session is None:
+        async with _new_client_session() as session:
+            return await crawl_site_async(start_url, max_pages, session=session, executor=executor)
+
+    loop = asyncio.get_running_loop()
+    start = urldefrag(start_url)[0]
+    # Parse the origin once; every discovered link is compared against it
+    origin_netloc = _urlparse(start).netloc
+
+    # BFS one frontier ("wave") at a time; every page in a wave is fetched concurrently
+    frontier: List[str] = [start]
+    seen: Set[str] = {start}
+    pages: List[str] = []
+
+    while frontier and len(pages) < max_pages:
+        wave = frontier[: max_pages - len(pages)]
+        pages.extend(wave)
+        htmls = await asyncio.gather(*(_fetch_text_async(session, u) for u in wave))
+        # Parsing is CPU-bound; keep it off the event loop so fetches keep flowing
+        link_lists = await asyncio.gather(
+            *(loop.run_in_executor(executor, _extract_links, html, url) for url, html in zip(wave, htmls) if html)
+        )
+        frontier = []
+        for links in link_lists:
+            for href in links:
+                if href not in seen and _on_netloc(href, origin_netloc):
+                    seen.add(href)
+                    frontier.append(href)
+    return pages
+
+
+async def collect_images_from_page_async(url: str, session=None, executor=None) -> Tuple[Set[str], Set[str]]:
+    # Async counterpart of collect_images_from_page; parsing runs in executor
+    # (default thread pool, or a process pool shared across a whole crawl)
+    if not _HAS_AIOHTTP:
+        return await asyncio.to_thread(collect_images_from_page, url)
+    if session is None:
+        async with _new_client_session() as session:
+            return await collect_images_from_page_async(url, session=session, executor=executor)
+    html = await _fetch_text_async(session, url)
+    if not html:
+        return set(), set()
+    loop = asyncio.get_running_loop()
+    img_urls, css_urls = await loop.run_in_executor(executor, extract_image_urls_from_html, html, url)
+
+    css_list = list(css_urls)
+    css_texts = await asyncio.gather(*(_fetch_text_async(session, u) for u in css_list))
+    for css_url, css_text in zip(css_list, css_texts):
+        if css_text:
+            css_imgs = await loop.run_in_executor(executor, extract_image_urls_from_css, css_text, css_url)
+            img_urls.update(css_imgs)
+    return img_urls, css_urls
+
+
 def crawl_site(start_url: str, max_pages: int = 20) -> List[str]:
+    if _HAS_AIOHTTP:
+        with parse_executor(max_pages) as executor:
+            return asyncio.run(crawl_site_async(start_url, max_pages=max_pages, executor=executor))
+
     start = urldefrag(start_url)[0]
-    origin = start
+    # Parse the origin once; every discovered link is compared against it
+    origin_netloc = _urlparse(start).netloc
 
-    queue: List[str] = [start]
+    queue: Deque[str] = deque([start])
     seen: Set[str] = set()
     pages: List[str] = []
 
     while queue and len(pages) < max_pages:
-        url = queue.pop(0)
+        url = queue.popleft()
         if url in seen:
             continue
         seen.add(url)
@@ -240,60 +597,320 @@ def crawl_site(start_url: str, max_pages: int = 20) -> List[str]:
         html = fetch_text(url)
         if not html:
             continue
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = absolute_url(a["href"], url)
-            href, _ = urldefrag(href)
-            if same_site(href, origin) and href not in seen:
+        for href in _extract_links(html, url):
+            if href not in seen and _on_netloc(href, origin_netloc):
                 queue.append(href)
     return pages
 
 
-def download_one(url: str, out_dir: Path) -> Tuple[str, str | None]:
-    data, content_type = fetch_bytes(url)
-    if not data:
-        return url, None
+_EXCL_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+# Downloads can create, rename and remove files relative to an open directory fd (not on Windows)
+_HAS_DIR_FD = {os.open, os.rename, os.unlink} <= os.supports_dir_fd
+
+
+def open_dir_fd(out_dir: Path) -> int | None:
+    """
+    Opens out_dir for download_all(..., dir_fd=...), so each file is resolved relative
+    to it instead of walking the full path again. None where unsupported; close it after.
+    """
+    if not _HAS_DIR_FD:
+        return None
+    try:
+        return os.open(out_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0))
+    except OSError:
+        return None
+
+
+def _at(path: Path, dir_fd: int | None):
+    # Name to hand to os.* calls: relative to dir_fd when one is given
+    return path.name if dir_fd is not None else path
+
+
+def _open_unique(path: Path, dir_fd: int | None = None) -> Tuple[int, Path]:
+    # Atomically creates path (or stem_1, stem_2, ...) and returns (fd, path), so
+    # concurrent downloads that map to the same name can never pick the same file
+    stem, ext = os.path.splitext(path.name)
+    for i in itertools.count():
+        candidate = path if i == 0 else path.with_name(f"{stem}_{i}{ext}")
+        try:
+            return os.open(_at(candidate, dir_fd), _EXCL_FLAGS, 0o644, dir_fd=dir_fd), candidate
+        except FileExistsError:
+            continue
+    raise AssertionError("unreachable")
+
+
+def _open_part(url: str, content_type: str | None, out_dir: Path, dir_fd: int | None = None) -> Tuple[BinaryIO, Path, Path] | None:
+    """
+    Opens a uniquely named "<name>.part" file for streaming; returns (file, part_path,
+    wanted_final_path) or None if not an image. The final name is only claimed on publish,
+    so downloads that turn out to be duplicates never take one.
+    """
     if not (is_probable_image_url(url) or (content_type and content_type.startswith("image/"))):
-        return url, None
+        return None
     name = safe_filename_from_url(url, content_type)
-    path = out_dir / name
-    # Ensure uniqueness
-    counter = 1
-    while path.exists():
-        stem, ext = os.path.splitext(name)
-        path = out_dir / f"{stem}_{counter}{ext}"
-        counter += 1
+    # Fallback to a hashed filename if something about the name/path fails
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    for final in (out_dir / name, out_dir / f"image_{digest}.bin"):
+        try:
+            fd, tmp = _open_unique(final.with_name(final.name + ".part"), dir_fd)
+        except OSError:
+            continue
+        return os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE), tmp, final
+    return None
+
+
+def _unlink_quietly(path: Path, dir_fd: int | None = None) -> None:
     try:
-        path.write_bytes(data)
+        os.unlink(_at(path, dir_fd), dir_fd=dir_fd)
     except OSError:
-        # Fallback to a hashed filename if something about the name/path fails
-        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
-        fallback = out_dir / f"image_{digest}.bin"
+        pass
+
+
+def _replace(src: Path, dst: Path, dir_fd: int | None = None) -> None:
+    os.replace(_at(src, dir_fd), _at(dst, dir_fd), src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+
+
+def _publish_new(tmp: Path, final: Path, dir_fd: int | None = None) -> Path:
+    # Claim a free name now that the bytes are being kept, then move them over it atomically
+    fd, target = _open_unique(final, dir_fd)
+    os.close(fd)
+    try:
+        _replace(tmp, target, dir_fd)
+    except OSError:
+        _unlink_quietly(target, dir_fd)
+        raise
+    return target
+
+
+def _finish_part(f: BinaryIO, tmp: Path, final: Path, keep: bool, *, url: str = "", digest: str | None = None, index: "_DownloadIndex | None" = None, dir_fd: int | None = None) -> str | None:
+    # Publish the finished download under (a free variant of) final, or discard it
+    try:
+        f.close()
+        if keep:
+            if index is not None and digest:
+                return str(index.publish(url, tmp, final, digest, dir_fd))
+            return str(_publish_new(tmp, final, dir_fd))
+    except OSError:
+        pass
+    _unlink_quietly(tmp, dir_fd)
+    return None
+
+
+INDEX_FILE_NAME = ".imagefetch_cache.json"
+
+
+def _is_bookkeeping_file(name: str) -> bool:
+    return name in {INDEX_FILE_NAME, "manifest.json"} or name.endswith(".part")
+
+
+def _sha1_file(path: Path) -> str:
+    h = hashlib.sha1(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _DownloadIndex:
+    """
+    Content SHA-1 -> saved file, plus url -> {"sha1", "file"} persisted in the output
+    folder so re-runs can skip URLs and bytes that are already on disk.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.by_digest: Dict[str, Path] = {}
+        self.by_url: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def load(cls, out_dir: Path) -> "_DownloadIndex":
+        index = cls()
         try:
-            fallback.write_bytes(data)
-            return url, str(fallback)
+            data = read_json(out_dir / INDEX_FILE_NAME)
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict):
+            for url, entry in data.items():
+                if not (isinstance(entry, dict) and isinstance(entry.get("sha1"), str) and isinstance(entry.get("file"), str)):
+                    continue
+                path = out_dir / entry["file"]
+                if path.is_file():
+                    index.by_url[url] = entry
+                    index.by_digest.setdefault(entry["sha1"], path)
+        # Hash files from earlier runs that the index does not know about
+        known = set(index.by_digest.values())
+        try:
+            for path in out_dir.iterdir():
+                if path.is_file() and path not in known and not _is_bookkeeping_file(path.name):
+                    index.by_digest.setdefault(_sha1_file(path), path)
+        except OSError:
+            pass
+        return index
+
+    def save(self, out_dir: Path) -> None:
+        try:
+            write_json(out_dir / INDEX_FILE_NAME, self.by_url)
+        except OSError:
+            pass
+
+    def split_resumed(self, urls: Iterable[str], out_dir: Path) -> Tuple[List[str], List[Tuple[str, str]]]:
+        # Returns (urls still to fetch, (url, path) already saved by a previous run)
+        pending: List[str] = []
+        reused: List[Tuple[str, str]] = []
+        for url in urls:
+            entry = self.by_url.get(url)
+            if entry:
+                reused.append((url, str(out_dir / entry["file"])))
+            else:
+                pending.append(url)
+        return pending, reused
+
+    def publish(self, url: str, tmp: Path, final: Path, digest: str, dir_fd: int | None = None) -> Path:
+        with self.lock:
+            existing = self.by_digest.get(digest)
+            if existing is None:
+                self.by_digest[digest] = existing = _publish_new(tmp, final, dir_fd)
+            else:
+                # Same bytes already saved under another URL; reuse that file
+                os.unlink(_at(tmp, dir_fd), dir_fd=dir_fd)
+            self.by_url[url] = {"sha1": digest, "file": existing.name}
+        return existing
+
+
+def _save_stream(url: str, chunks: Iterable[bytes], content_type: str | None, out_dir: Path, index: _DownloadIndex | None = None, dir_fd: int | None = None) -> str | None:
+    opened = _open_part(url, content_type, out_dir, dir_fd)
+    if opened is None:
+        return None
+    f, tmp, final = opened
+    h = hashlib.sha1(usedforsecurity=False)
+    written = 0
+    try:
+        for chunk in chunks:
+            f.write(chunk)
+            h.update(chunk)
+            written += len(chunk)
+    except BaseException:
+        _finish_part(f, tmp, final, False, dir_fd=dir_fd)
+        raise
+    return _finish_part(f, tmp, final, written > 0, url=url, digest=h.hexdigest(), index=index, dir_fd=dir_fd)
+
+
+def download_one(url: str, out_dir: Path, index: _DownloadIndex | None = None, dir_fd: int | None = None) -> Tuple[str, str | None]:
+    from requests import exceptions as req_exc
+
+    for attempt in range(3):
+        try:
+            with _session().get(url, timeout=REQUEST_TIMEOUT, stream=True) as r:
+                if 200 <= r.status_code < 300:
+                    content_type = r.headers.get("Content-Type")
+                    # Stream straight to disk instead of holding the body in memory
+                    return url, _save_stream(url, r.iter_content(CHUNK_SIZE), content_type, out_dir, index, dir_fd)
+                if r.status_code in RETRY_STATUSES:
+                    time.sleep(0.5 * (2 ** attempt))
+                    continue
+                return url, None
+        except (req_exc.Timeout, req_exc.ConnectionError):
+            time.sleep(0.5 * (2 ** attempt))
         except Exception:
             return url, None
-    return url, str(path)
+    return url, None
 
 
-def download_all(urls: Iterable[str], out_dir: Path, max_workers: int = 8, progress_cb=None) -> Tuple[List[Tuple[str, str]], List[str]]:
-    successes: List[Tuple[str, str]] = []
-    failures: List[str] = []
-    out_dir.mkdir(parents=True, exist_ok=True)
-    lock = threading.Lock()
-    urls_list = list(urls)
-    total = len(urls_list)
-    completed = 0
+async def _download_one_async(session, url: str, out_dir: Path, index: _DownloadIndex | None = None, dir_fd: int | None = None) -> Tuple[str, str | None]:
+    import aiohttp
 
+    for attempt in range(3):
+        try:
+            async with session.get(url) as r:
+                if 200 <= r.status < 300:
+                    content_type = r.headers.get("Content-Type")
+                    # Disk I/O is blocking; keep it off the event loop and flush in large blocks
+                    opened = await asyncio.to_thread(_open_part, url, content_type, out_dir, dir_fd)
+                    if opened is None:
+                        return url, None
+                    f, tmp, final = opened
+                    h = hashlib.sha1(usedforsecurity=False)
+                    buf = bytearray()
+                    written = 0
+                    try:
+                        async for chunk in r.content.iter_chunked(CHUNK_SIZE):
+                            buf += chunk
+                            h.update(chunk)
+                            if len(buf) >= WRITE_BUFFER_SIZE:
+                                await asyncio.to_thread(f.write, buf)
+                                written += len(buf)
+                                buf.clear()
+                        if buf:
+                            await asyncio.to_thread(f.write, buf)
+                            written += len(buf)
+                    except BaseException:
+                        await asyncio.to_thread(_finish_part, f, tmp, final, False, dir_fd=dir_fd)
+                        raise
+                    saved = await asyncio.to_thread(
+                        _finish_part, f, tmp, final, written > 0, url=url, digest=h.hexdigest(), index=index, dir_fd=dir_fd
+                    )
+                    return url, saved
+                if r.status in RETRY_STATUSES:
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    continue
+                return url, None
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            await asyncio.sleep(0.5 * (2 ** attempt))
+        except Exception:
+            return url, None
+    return url, None
+
+
+def _report_progress(progress_cb, total: int, completed: int) -> None:
     if progress_cb:
         try:
             progress_cb(total, completed)
         except Exception:
             pass
 
+
+async def _download_all_async(urls_list: List[str], out_dir: Path, progress_cb=None, session=None, index: _DownloadIndex | None = None, reused: List[Tuple[str, str]] | None = None, dir_fd: int | None = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+    if session is None:
+        async with _new_client_session() as session:
+            return await _download_all_async(urls_list, out_dir, progress_cb=progress_cb, session=session, index=index, reused=reused, dir_fd=dir_fd)
+
+    successes: List[Tuple[str, str]] = list(reused or [])
+    failures: List[str] = []
+    total = len(urls_list) + len(successes)
+    completed = len(successes)
+    _report_progress(progress_cb, total, completed)
+
+    sem = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+
+    async def run(url: str) -> None:
+        nonlocal completed
+        try:
+            async with sem:
+                url, saved_path = await _download_one_async(session, url, out_dir, index, dir_fd)
+            if saved_path:
+                successes.append((url, saved_path))
+            else:
+                failures.append(f"{url} — download failed")
+        except Exception as e:
+            failures.append(f"<exception> {e}")
+        finally:
+            completed += 1
+            _report_progress(progress_cb, total, completed)
+
+    await asyncio.gather(*(run(u) for u in urls_list))
+    return successes, failures
+
+
+def _download_all_threaded(urls_list: List[str], out_dir: Path, max_workers: int = 8, progress_cb=None, index: _DownloadIndex | None = None, reused: List[Tuple[str, str]] | None = None, dir_fd: int | None = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+    successes: List[Tuple[str, str]] = list(reused or [])
+    failures: List[str] = []
+    lock = threading.Lock()
+    total = len(urls_list) + len(successes)
+    completed = len(successes)
+    _report_progress(progress_cb, total, completed)
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(download_one, url, out_dir) for url in urls_list]
+        futures = [ex.submit(download_one, url, out_dir, index, dir_fd) for url in urls_list]
         for fut in concurrent.futures.as_completed(futures):
             try:
                 url, saved_path = fut.result()
@@ -307,28 +924,99 @@ def download_all(urls: Iterable[str], out_dir: Path, max_workers: int = 8, progr
                     failures.append(f"<exception> {e}")
             finally:
                 completed += 1
-                if progress_cb:
-                    try:
-                        progress_cb(total, completed)
-                    except Exception:
-                        pass
+                _report_progress(progress_cb, total, completed)
     return successes, failures
 
 
+def _prepare_download(urls: Iterable[str], out_dir: Path, resume: bool) -> Tuple[_DownloadIndex, List[str], List[Tuple[str, str]]]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = _DownloadIndex.load(out_dir) if resume else _DownloadIndex()
+    urls_list, reused = index.split_resumed(urls, out_dir)
+    return index, urls_list, reused
+
+
+def download_all(urls: Iterable[str], out_dir: Path, max_workers: int = 8, progress_cb=None, resume: bool = False, dir_fd: int | None = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Downloads urls into out_dir; identical bytes are saved once. With resume=True, URLs
+    and contents recorded by a previous run into the same folder are not fetched again.
+    dir_fd, if given, is an open descriptor for out_dir (see open_dir_fd).
+    """
+    if _HAS_AIOHTTP:
+        return asyncio.run(download_all_async(urls, out_dir, progress_cb=progress_cb, resume=resume, dir_fd=dir_fd))
+    index, urls_list, reused = _prepare_download(urls, out_dir, resume)
+    result = _download_all_threaded(urls_list, out_dir, max_workers=max_workers, progress_cb=progress_cb, index=index, reused=reused, dir_fd=dir_fd)
+    index.save(out_dir)
+    return result
+
+
+async def download_all_async(urls: Iterable[str], out_dir: Path, progress_cb=None, resume: bool = False, session=None, dir_fd: int | None = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Awaitable download_all for callers that already run an event loop.
+    progress_cb is always invoked on that loop's thread.
+    """
+    if not _HAS_AIOHTTP:
+        loop = asyncio.get_running_loop()
+        cb = (lambda total, completed: loop.call_soon_threadsafe(progress_cb, total, completed)) if progress_cb else None
+        return await asyncio.to_thread(download_all, urls, out_dir, progress_cb=cb, resume=resume, dir_fd=dir_fd)
+    # Loading a resume index hashes files on disk; keep that off the loop
+    index, urls_list, reused = await asyncio.to_thread(_prepare_download, urls, out_dir, resume)
+    result = await _download_all_async(urls_list, out_dir, progress_cb=progress_cb, session=session, index=index, reused=reused, dir_fd=dir_fd)
+    await asyncio.to_thread(index.save, out_dir)
+    return result
+
+
+def json_dumps(obj) -> bytes:
+    # Pretty-printed UTF-8 JSON; orjson is several times faster on large manifests
+    if _HAS_ORJSON:
+        import orjson
+
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def write_json(path: Path, obj) -> None:
+    if _HAS_ORJSON:
+        path.write_bytes(json_dumps(obj))
+        return
+    # Stream into the file instead of building the whole document (str, then bytes) first
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+
+
+def read_json(path: Path):
+    data = path.read_bytes()
+    if _HAS_ORJSON:
+        import orjson
+
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Images are already entropy-coded; only text-like files are worth deflating
+_DEFLATE_SUFFIXES = (".json", ".svg", ".css", ".html")
+
+
 def zip_output_folder(out_dir: Path) -> Path:
     base = out_dir.resolve()
-    zip_base = base.parent / base.name
-    # shutil.make_archive returns the filename including extension
-    zip_path = shutil.make_archive(str(zip_base), "zip", root_dir=str(base))
-    return Path(zip_path)
+    zip_path = base.parent / (base.name + ".zip")
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for root, _dirs, files in os.walk(base):
+            for fn in files:
+                # The resume index and stray partial downloads are not part of the output
+                if fn == INDEX_FILE_NAME or fn.endswith(".part"):
+                    continue
+                full = Path(root) / fn
+                comp = zipfile.ZIP_DEFLATED if fn.lower().endswith(_DEFLATE_SUFFIXES) else zipfile.ZIP_STORED
+                zf.write(full, full.relative_to(base), compress_type=comp)
+    return zip_path
 
 
 def _open_path_cross_platform(path: Path) -> bool:
     try:
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             os.startfile(path)  # type: ignore[attr-defined]
             return True
-        elif platform.system() == "Darwin":
+        elif _SYSTEM == "Darwin":
             opener = shutil.which("open")
             if opener:
                 subprocess.run([opener, str(path)], check=False)
@@ -347,8 +1035,16 @@ def _open_path_cross_platform(path: Path) -> bool:
 def main():
     parser = argparse.ArgumentParser(description="Save all images from a page or site")
     parser.add_argument("--open-output", "-O", action="store_true", help="Open the output folder when done")
+    parser.add_argument("--resume", action="store_true", help="Skip images already saved in the output folder by a previous run")
+    parser.add_argument("--refresh", action="store_true", help="Clear the cached pages and stylesheets before scraping")
     args, _unknown = parser.parse_known_args()
 
+    if args.refresh:
+        try:
+            clear_http_cache()
+        except Exception as e:
+            print(f"Failed to clear HTTP cache: {e}")
+
     print("Image Scraper - Save all images from a page or site")
     url = input("Enter a URL: ").strip()
     if not url:
@@ -390,8 +1086,7 @@ def main():
         all_css.update(css)
 
     # Remove data URLs from download set; optionally save them later
-    data_images = {u for u in all_images if u.startswith("data:image/")}
-    http_images = [u for u in all_images if not u.startswith("data:")]
+    http_images, data_images = partition_image_urls(all_images)
 
     print(f"Found {len(all_images)} images ({len(http_images)} downloadable, {len(data_images)} data URLs).")
     print(f"Downloading to {out_dir.resolve()} ...")
@@ -400,18 +1095,19 @@ def main():
         # Simple CLI progress output
         print(f"Progress: {completed}/{total}", end="\r", flush=True)
 
-    successes, failures = download_all(http_images, out_dir, progress_cb=cli_progress)
+    successes, failures = download_all(http_images, out_dir, progress_cb=cli_progress, resume=args.resume)
 
     manifest = {
         "source_pages": pages,
         "downloaded": [{"url": u, "path": p} for (u, p) in successes],
         "failed": failures,
-        "data_urls": list(data_images)[:50],  # limit manifest size
         "css_files": list(all_css),
         "created_at": datetime.now().isoformat(timespec="seconds"),
     }
+    if data_images:
+        manifest["data_urls"] = data_url_previews(data_images)
     try:
-        (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        write_json(out_dir / "manifest.json", manifest)
     except Exception as e:
         print(f"Failed to write manifest.json: {e}")
 
@@ -432,9 +1128,9 @@ def main():
 
     if args.open_output:
         # Warn if opener missing on non-Windows
-        if platform.system() == "Darwin" and not shutil.which("open"):
+        if _SYSTEM == "Darwin" and not shutil.which("open"):
             print(f"Note: 'open' command not found; cannot auto-open. Folder: {out_dir}")
-        elif platform.system() not in ("Windows", "Darwin") and not shutil.which("xdg-open"):
+        elif _SYSTEM not in ("Windows", "Darwin") and not shutil.which("xdg-open"):
             print(f"Note: 'xdg-open' not found; cannot auto-open. Folder: {out_dir}")
         else:
             ok = _open_path_cross_platform(out_dir)
@@ -1,23 +1,53 @@
 #!/usr/bin/env python3
+import concurrent.futures
+import sys
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import subprocess
+# filedialog, messagebox and subprocess are imported where they are used, keeping startup lean
+from tkinter import ttk
 import platform
 import os
 import json
 
 from image_scraper import (
+    clear_page_cache,
     crawl_site,
     collect_images_from_page,
     download_all,
+    open_dir_fd,
+    data_url_previews,
+    partition_image_urls,
+    write_json,
     zip_output_folder,
 )
-import json
+
+_SYSTEM = platform.system()
+
+# Optional: tkthread.call runs a function on the Tk thread and waits for it, so _ui
+# needn't queue. tkinstall() patches tkinter.Tk, so it runs before any root exists;
+# it refuses non-CPython runtimes, which then keep the queue.
+try:
+    import tkthread  # type: ignore
+
+    tkthread.tkinstall()
+    _TKTHREAD_AVAILABLE = True
+except Exception:
+    _TKTHREAD_AVAILABLE = False
+
+# Pages scanned for images at once (each scan is mostly waiting on HTTP)
+COLLECT_WORKERS = 8
+# Milliseconds between runs of the UI queue fed by the worker thread
+UI_DRAIN_MS = 50
+# Minimum seconds between forwarded progress ticks (a 0.5% step also forwards one)
+PROGRESS_INTERVAL = 0.05
+# Oldest log lines are dropped beyond this many
+LOG_MAX_LINES = 5000
 
 
 class ImageScraperGUI:
@@ -33,11 +63,22 @@ class ImageScraperGUI:
 
         self.total = 0
         self.completed = 0
+        # Progressbar maximum last configured; -1 forces the first configure
+        self._last_total = -1
         self.out_dir_path: Path | None = None
         self.zip_path: Path | None = None
         # Default: off; can be overridden by saved prefs
         self.open_when_done_var = tk.BooleanVar(value=False)
 
+        # Worker-thread callbacks wait here for the Tk thread; progress keeps only the latest value
+        self._ui_queue: deque = deque()
+        self._ui_lock = threading.Lock()
+        self._pending_progress: tuple[int, int] | None = None
+        self._log_buf: list[str] = []
+        # Last preferences read from / written to disk; unchanged prefs are not rewritten
+        self._prefs: dict = {}
+        self._save_pending = False
+
         self._build_ui()
         self._load_prefs()
 
@@ -96,79 +137,119 @@ class ImageScraperGUI:
         self.open_zip_btn.grid(row=0, column=2, padx=6)
 
         self._toggle_crawl()
+        self.root.after(UI_DRAIN_MS, self._drain_ui_queue)
 
     def _open_path(self, p: Path):
         try:
-            if platform.system() == "Windows":
+            import subprocess
+
+            if _SYSTEM == "Windows":
                 os.startfile(p)  # type: ignore[attr-defined]
-            elif platform.system() == "Darwin":
+            elif _SYSTEM == "Darwin":
                 subprocess.run(["open", str(p)], check=False)
             else:
                 subprocess.run(["xdg-open", str(p)], check=False)
         except Exception:
+            from tkinter import messagebox
+
             messagebox.showinfo("Open", str(p))
 
     def choose_dir(self):
+        from tkinter import filedialog
+
         d = filedialog.askdirectory()
         if d:
             self.out_dir_var.set(d)
-            self._save_prefs()
+            self._schedule_save_prefs()
 
     def _toggle_crawl(self):
         state = tk.NORMAL if self.crawl_var.get() else tk.DISABLED
         self.max_pages_entry.configure(state=state)
 
     def log_line(self, msg: str):
-        self.log.insert(tk.END, msg + "\n")
+        # Lines are written in bulk by _flush_log on the next drain
+        with self._ui_lock:
+            self._log_buf.append(msg)
+
+    def _flush_log(self):
+        with self._ui_lock:
+            batch, self._log_buf = self._log_buf, []
+        if not batch:
+            return
+        self.log.insert(tk.END, "\n".join(batch) + "\n")
+        lines = int(self.log.index("end-1c").split(".")[0]) - 1
+        if lines > LOG_MAX_LINES:
+            self.log.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
         self.log.see(tk.END)
 
     def set_progress(self, total: int, completed: int):
         self.total = total
         self.completed = completed
-        self.progress.configure(maximum=max(total, 1))
+        if total != self._last_total:
+            self.progress.configure(maximum=max(total, 1))
+            self._last_total = total
         self.progress['value'] = completed
         self.progress_label.configure(text=f"Downloading {completed}/{total} images...")
 
     def start(self):
         url = self.url_var.get().strip()
         if not url:
+            from tkinter import messagebox
+
             messagebox.showerror("Error", "Please enter a URL.")
             return
-        if not urlparse(url).scheme:
+        parsed = urlparse(url)
+        if not parsed.scheme:
             url = "https://" + url
             self.url_var.set(url)
+            parsed = urlparse(url)
         # Validate domain
-        if not urlparse(url).netloc:
+        if not parsed.netloc:
+            from tkinter import messagebox
+
             messagebox.showerror("Error", "Invalid URL. Please include a valid domain.")
             return
 
         out_dir_str = self.out_dir_var.get().strip()
         if not out_dir_str:
-            default_dir_name = f"images_{urlparse(url).netloc}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            default_dir_name = f"images_{parsed.netloc}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             out_dir_str = str(Path.cwd() / default_dir_name)
             self.out_dir_var.set(out_dir_str)
 
-        try:
-            max_pages = int(self.max_pages_var.get()) if self.crawl_var.get() else 1
-        except ValueError:
-            messagebox.showwarning("Warning", "Max pages must be a number; defaulting to 20.")
-            max_pages = 20
+        max_pages = 1
+        if self.crawl_var.get():
+            # isdecimal(), not isdigit(): it accepts exactly what int() can parse (no "²")
+            raw = self.max_pages_var.get().strip()
+            max_pages = int(raw) if raw.isdecimal() else 0
+            if max_pages < 1:
+                if raw:
+                    from tkinter import messagebox
+
+                    messagebox.showwarning("Warning", "Max pages must be a positive number; defaulting to 20.")
+                max_pages = 20
 
         self.start_btn.configure(state=tk.DISABLED)
         self.open_folder_btn.configure(state=tk.DISABLED)
         self.open_zip_btn.configure(state=tk.DISABLED)
+        with self._ui_lock:
+            self._log_buf.clear()
         self.log.delete("1.0", tk.END)
         self.progress_label.configure(text="Starting...")
         self.progress['value'] = 0
 
         self.out_dir_path = Path(out_dir_str)
         # Persist chosen folder and preference before starting
-        self._save_prefs()
+        self._schedule_save_prefs()
 
         threading.Thread(target=self._run_scrape, args=(url, max_pages), daemon=True).start()
 
     def _run_scrape(self, url: str, max_pages: int):
+        from tkinter import messagebox
+
         try:
+            # Pages last read by a previous scrape must be fetched (revalidated) again
+            clear_page_cache()
+
             # Pages
             if self.crawl_var.get():
                 self._ui(lambda: self.log_line(f"Crawling up to {max_pages} pages..."))
@@ -177,39 +258,60 @@ class ImageScraperGUI:
                 pages = [url]
             self._ui(lambda: self.log_line(f"Scanning {len(pages)} page(s) for images..."))
 
-            # Collect images
-            all_images = set()
-            all_css = set()
-            for p in pages:
-                imgs, css = collect_images_from_page(p)
-                all_images.update(imgs)
-                all_css.update(css)
-                self._ui(lambda p=p, i=len(imgs): self.log_line(f"Found {i} images on {p}"))
-
-            data_images = {u for u in all_images if u.startswith("data:image/")}
-            http_images = [u for u in all_images if not u.startswith("data:")]
+            # Collect images; pages are scanned in parallel and logged as they finish
+            results = {}
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(COLLECT_WORKERS, len(pages)))) as ex:
+                futs = {ex.submit(collect_images_from_page, p): p for p in pages}
+                for fut in concurrent.futures.as_completed(futs):
+                    p = futs[fut]
+                    results[p] = imgs, css = fut.result()
+                    self._ui(lambda p=p, i=len(imgs): self.log_line(f"Found {i} images on {p}"))
+            # Merge in page order, each page's URLs sorted (they come back as sets), so the
+            # download list and manifest are the same on every run; dict keys dedupe
+            all_images = dict.fromkeys(u for p in pages for u in sorted(results[p][0]))
+            all_css = dict.fromkeys(u for p in pages for u in sorted(results[p][1]))
+
+            http_images, data_images = partition_image_urls(all_images)
 
             self._ui(lambda: self.log_line(f"Found {len(all_images)} images ({len(http_images)} downloadable, {len(data_images)} data URLs)."))
 
-            # Download with progress
-            def progress_cb(total, completed):
-                self._ui(lambda: self.set_progress(total, completed))
+            # Download with progress; forward at most every 0.5% / PROGRESS_INTERVAL, always the last tick
+            last_sent = 0
+            last_time = time.monotonic()
 
-            successes, failures = download_all(http_images, self.out_dir_path, progress_cb=progress_cb)
+            def progress_cb(total, completed):
+                nonlocal last_sent, last_time
+                now = time.monotonic()
+                if completed == total or completed - last_sent >= max(1, total // 200) or now - last_time >= PROGRESS_INTERVAL:
+                    last_sent, last_time = completed, now
+                    self._ui_progress(total, completed)
+
+            # Create the folder once and resolve every download relative to it
+            self.out_dir_path.mkdir(parents=True, exist_ok=True)
+            dir_fd = open_dir_fd(self.out_dir_path)
+            try:
+                successes, failures = download_all(http_images, self.out_dir_path, progress_cb=progress_cb, dir_fd=dir_fd)
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
 
             manifest = {
                 "source_pages": pages,
                 "downloaded": [{"url": u, "path": p} for (u, p) in successes],
                 "failed": failures,
-                "data_urls": list(data_images)[:50],
                 "css_files": list(all_css),
             }
+            if data_images:
+                manifest["data_urls"] = data_url_previews(data_images)
             try:
-                (self.out_dir_path / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+                write_json(self.out_dir_path / "manifest.json", manifest)
             except Exception as e:
                 self._ui(lambda e=e: self.log_line(f"Failed to write manifest.json: {e}"))
 
-            # Zip
+            # Zip (already off the Tk thread); show the download summary while it runs
+            self._ui(lambda: self.log_line(f"Downloaded {len(successes)} images; failed {len(failures)}."))
+            self._ui(lambda: self.log_line("Done downloading, compressing…"))
+            self._ui(lambda: self.progress_label.configure(text="Compressing…"))
             try:
                 zip_path = zip_output_folder(self.out_dir_path)
                 self.zip_path = zip_path
@@ -217,36 +319,75 @@ class ImageScraperGUI:
                 self._ui(lambda e=e: self.log_line(f"Failed to create ZIP: {e}"))
                 zip_path = None
 
-            self._ui(lambda: self.log_line(f"Downloaded {len(successes)} images; failed {len(failures)}."))
             if zip_path:
                 self._ui(lambda: self.log_line(f"Created ZIP: {zip_path}"))
             self._ui(lambda: self.progress_label.configure(text="Done."))
             self._ui(lambda: self.start_btn.configure(state=tk.NORMAL))
             self._ui(lambda: self.open_folder_btn.configure(state=tk.NORMAL))
             self._ui(lambda: self.open_zip_btn.configure(state=tk.NORMAL))
-            self._ui(lambda: messagebox.showinfo("Completed", f"Saved to:\n{self.out_dir_path}\n\nZIP:\n{zip_path}"))
+            self._ui(lambda: self._dialog(messagebox.showinfo, "Completed", f"Saved to:\n{self.out_dir_path}\n\nZIP:\n{zip_path}"))
 
             # Auto-open output folder if requested
             if self.open_when_done_var.get() and self.out_dir_path and self.out_dir_path.exists():
                 self._ui(lambda: self._open_path(self.out_dir_path))
         except Exception as e:
             self._ui(lambda: self.start_btn.configure(state=tk.NORMAL))
-            self._ui(lambda: messagebox.showerror("Error", str(e)))
+            self._ui(lambda: self._dialog(messagebox.showerror, "Error", str(e)))
+
+    def _dialog(self, show, *args):
+        # A modal dialog holds up the drain until closed; write the pending log lines first
+        self._flush_log()
+        show(*args)
 
     def _ui(self, fn):
-        self.root.after(0, fn)
+        if _TKTHREAD_AVAILABLE:
+            # Run it on the Tk thread now, behind any pending progress and log lines,
+            # so a later drain can't overwrite what it sets
+            tkthread.call(self._run_ui, [fn])
+            return
+        with self._ui_lock:
+            self._ui_queue.append(fn)
+
+    def _ui_progress(self, total: int, completed: int):
+        with self._ui_lock:
+            self._pending_progress = (total, completed)
+
+    def _run_ui(self, batch):
+        # Tk thread only: progress and lines logged before this batch go out first; see also _dialog
+        with self._ui_lock:
+            progress, self._pending_progress = self._pending_progress, None
+        self._flush_log()
+        if progress is not None:
+            self.set_progress(*progress)
+        for fn in batch:
+            # Each callback stands alone, as it did with one after() per call
+            try:
+                fn()
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        self._flush_log()
+
+    def _drain_ui_queue(self):
+        # One Tk callback per UI_DRAIN_MS runs everything queued since the last one
+        with self._ui_lock:
+            batch = list(self._ui_queue)
+            self._ui_queue.clear()
+        try:
+            self._run_ui(batch)
+        finally:
+            self.root.after(UI_DRAIN_MS, self._drain_ui_queue)
 
     def open_folder(self):
-        if self.out_dir_path and self.out_dir_path.exists():
+        if self.out_dir_path:
             self._open_path(self.out_dir_path)
 
     def open_zip(self):
-        if self.zip_path and self.zip_path.exists():
+        if self.zip_path:
             self._open_path(self.zip_path)
 
     # Preferences persistence
     def _config_dir(self) -> Path:
-        if platform.system() == "Windows":
+        if _SYSTEM == "Windows":
             base = Path(os.environ.get("APPDATA", Path.home()))
             return base / "imageFetch"
         else:
@@ -259,8 +400,10 @@ class ImageScraperGUI:
         try:
             cfg_path = self._config_file()
             if cfg_path.exists():
-                data = json.load(open(cfg_path, "r", encoding="utf-8"))
+                with open(cfg_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
                 if isinstance(data, dict):
+                    self._prefs = data
                     open_pref = data.get("open_when_done")
                     if isinstance(open_pref, bool):
                         self.open_when_done_var.set(open_pref)
@@ -272,22 +415,36 @@ class ImageScraperGUI:
 
     def _save_prefs(self):
         try:
-            cfg_dir = self._config_dir()
-            cfg_dir.mkdir(parents=True, exist_ok=True)
-            cfg_path = self._config_file()
             data = {
                 "open_when_done": bool(self.open_when_done_var.get()),
                 "last_out_dir": self.out_dir_var.get().strip(),
             }
+            if data == self._prefs:
+                return
+            cfg_dir = self._config_dir()
+            cfg_dir.mkdir(parents=True, exist_ok=True)
+            cfg_path = self._config_file()
             with open(cfg_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2)
+            self._prefs = data
         except Exception:
             pass
 
-    def _on_open_when_done_toggle(self):
+    def _schedule_save_prefs(self):
+        # Input handlers only queue the write; repeated requests share one idle-time save
+        if not self._save_pending:
+            self._save_pending = True
+            self.root.after_idle(self._flush_save)
+
+    def _flush_save(self):
+        self._save_pending = False
         self._save_prefs()
 
+    def _on_open_when_done_toggle(self):
+        self._schedule_save_prefs()
+
     def _on_close(self):
+        # Written synchronously so the last change survives the window closing
         self._save_prefs()
         self.root.destroy()
 